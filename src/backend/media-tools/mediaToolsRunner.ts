@@ -469,6 +469,7 @@ const runMediaToolsCommand = async <T>(
     let stdoutBuffer = '';
     let stderrBuffer = '';
     let result: T | null = null;
+    const streamedSegments: WhisperSegment[] = [];
 
     proc.stdout.on('data', (data) => {
       const text = data.toString();
@@ -501,16 +502,53 @@ const runMediaToolsCommand = async <T>(
             console.warn('Failed to parse progress:', line);
           }
         }
+        // Parse streamed segments: SEGMENT|{json}
+        else if (line.startsWith('SEGMENT|')) {
+          try {
+            streamedSegments.push(JSON.parse(line.substring(8)));
+          } catch (err) {
+            console.warn('Failed to parse segment:', line);
+          }
+        }
         // Parse result: RESULT|{json}
         else if (line.startsWith('RESULT|')) {
           try {
             const resultJson = line.substring(7);
             result = JSON.parse(resultJson);
+            // Streamed transcriptions send segments as SEGMENT| lines and a
+            // final RESULT| without them; re-attach the collected segments
+            if (
+              result &&
+              streamedSegments.length > 0 &&
+              !(result as Partial<WhisperResult>).segments
+            ) {
+              (result as Partial<WhisperResult>).segments = streamedSegments;
+            }
             console.log(`✅ Received ${command} result`);
           } catch (err) {
             console.error('Failed to parse result:', err);
           }
         }
+        // Parse large-result handoff: RESULT_FD|<path> — the JSON is in a
+        // temp file instead of the pipe; read it, then clean it up
+        else if (line.startsWith('RESULT_FD|')) {
+          const resultPath = line.substring(10);
+          try {
+            result = JSON.parse(fs.readFileSync(resultPath, 'utf-8'));
+            if (
+              result &&
+              streamedSegments.length > 0 &&
+              !(result as Partial<WhisperResult>).segments
+            ) {
+              (result as Partial<WhisperResult>).segments = streamedSegments;
+            }
+            console.log(`✅ Received ${command} result (file handoff)`);
+          } catch (err) {
+            console.error('Failed to read result file:', err);
+          } finally {
+            fs.unlink(resultPath, () => {});
+          }
+        }
         // Parse result saved notification
         else if (line.startsWith('RESULT_SAVED|')) {
           const filePath = line.substring(13);
@@ -10,14 +10,289 @@ Usage:
 """
 
 import argparse
+import functools
 import json
+import os
 import sys
-from scripts import transcribe, noisereduction
+from pathlib import Path
+
+# NOTE: scripts.transcribe / scripts.noisereduction are imported lazily inside
+# the command handlers. They transitively pull in torch, ctranslate2 and
+# friends (~1-2 s and a large RSS hit), which --version/--help and argparse
+# error paths should not pay for.
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to stdlib json
 
 __version__ = "1.0.0"
 
 
-def main():
+def _serialize(obj) -> bytes:
+    """Serialize to JSON bytes via orjson when available, stdlib otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def emit_line(prefix: bytes, obj) -> None:
+    """Write a <PREFIX>|{json} line to stdout as one buffered write."""
+    out = sys.stdout.buffer
+    out.write(prefix + _serialize(obj) + b"\n")
+    out.flush()
+
+
+# Results above this size are handed to the consumer through a temp file
+# (RESULT_FD|<path>) instead of inline on stdout. A long transcript
+# serializes to megabytes, which would otherwise trickle through the pipe
+# buffer in 64KB chunks and be re-assembled line-by-line on the Electron
+# side before it can even be parsed.
+_RESULT_INLINE_MAX = 256 * 1024
+
+
+def emit_result(result) -> None:
+    """
+    Emit a result to stdout.
+
+    Small payloads go inline as a RESULT|{json} line (one buffered write,
+    orjson when available). Large ones are written to a temp file and
+    announced as RESULT_FD|<path>; the consumer reads and deletes the file.
+    """
+    payload = _serialize(result)
+    if len(payload) > _RESULT_INLINE_MAX:
+        import tempfile
+
+        fd, path = tempfile.mkstemp(prefix="dividr-result-", suffix=".json")
+        with os.fdopen(fd, "wb") as handoff:
+            handoff.write(payload)
+        out = sys.stdout.buffer
+        out.write(b"RESULT_FD|" + path.encode("utf-8") + b"\n")
+    else:
+        out = sys.stdout.buffer
+        out.write(b"RESULT|" + payload + b"\n")
+    out.flush()
+
+
+def _get_model(model_size: str, device: str, compute_type: str):
+    """
+    Load (or reuse) a Whisper model for the given configuration.
+
+    Delegates to transcribe's module-level cache so batch mode here and
+    library callers of transcribe share the same loaded instances.
+    """
+    from scripts import transcribe
+    return transcribe._get_model(model_size, device, compute_type)
+
+
+def _apply_worker_thread_limits():
+    """
+    Limit math-library threads inside pool workers so N workers don't each
+    try to use every core (runs before numpy/torch spin up their pools).
+    """
+    os.environ.setdefault("OMP_NUM_THREADS", "2")
+    os.environ.setdefault("MKL_NUM_THREADS", "2")
+
+
+def _run_one(command: str, input_path: str, output_path: str, options: dict):
+    """Process a single file in a pool worker; returns (input, output, error)."""
+    try:
+        if command == "transcribe":
+            from scripts import transcribe
+            transcribe.run(input_path, output_path, **options)
+        elif command == "spectral-subtract":
+            from scripts import spectralsub
+            spectralsub.run(input_path, output_path, **options)
+        else:
+            from scripts import noisereduction
+            noisereduction.run(input_path, output_path, **options)
+        # run() reports a missing input by writing ERROR| to stderr and
+        # returning; that must surface as ERR, not OK with no file
+        if not Path(output_path).exists():
+            return input_path, output_path, "no output produced (see stderr)"
+        return input_path, output_path, None
+    except SystemExit as e:
+        # noisereduction/spectralsub run() sys.exit(1) on processing errors
+        # after writing their ERROR| line; 'except Exception' misses it and
+        # it would otherwise re-raise out of future.result() in the parent
+        return input_path, output_path, f"processing failed (exit {e.code})"
+    except Exception as e:
+        return input_path, output_path, str(e)
+
+
+def run_glob(command: str, pattern: str, outputs_dir: str, options: dict) -> int:
+    """
+    Fan a glob of input files out over a process pool.
+
+    Audio files are independent, so this parallelizes across files with one
+    worker per half of the cores (leaving headroom for each worker's own
+    FFT/BLAS threads). One 'OK\t<output>' or 'ERR\t<input>\t<message>' line
+    is emitted per file.
+    """
+    import glob
+    from concurrent.futures import ProcessPoolExecutor
+
+    inputs = sorted(glob.glob(pattern))
+    if not inputs:
+        print(f"ERROR|No inputs match pattern: {pattern}", file=sys.stderr, flush=True)
+        return 1
+
+    if not outputs_dir:
+        print("ERROR|--outputs-dir is required when --input is a glob pattern",
+              file=sys.stderr, flush=True)
+        return 1
+
+    out_dir = Path(outputs_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    suffix = ".json" if command == "transcribe" else ".wav"
+
+    max_workers = max(1, (os.cpu_count() or 2) // 2)
+    exit_code = 0
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_apply_worker_thread_limits
+    ) as pool:
+        futures = [
+            (
+                input_path,
+                pool.submit(
+                    _run_one,
+                    command,
+                    input_path,
+                    str(out_dir / (Path(input_path).stem + suffix)),
+                    options
+                )
+            )
+            for input_path in inputs
+        ]
+        for submitted_input, future in futures:
+            try:
+                input_path, output_path, error = future.result()
+            except Exception as e:
+                # A worker dying outright (OOM kill, BrokenProcessPool) must
+                # not stop the remaining files from being reported
+                print(f"ERR\t{submitted_input}\t{e}", flush=True)
+                exit_code = 1
+                continue
+            if error is None:
+                print(f"OK\t{output_path}", flush=True)
+            else:
+                print(f"ERR\t{input_path}\t{error}", flush=True)
+                exit_code = 1
+
+    return exit_code
+
+
+def run_batch() -> int:
+    """
+    Batch mode: process jobs read from stdin, one per line, in a single
+    process so imports and model loads are paid once instead of per file.
+
+    Line format (tab-separated):
+        <command>\t<input>\t<output>[\t<json_kwargs>]
+
+    where <command> is 'transcribe', 'noise-reduce' or 'spectral-subtract'
+    and <json_kwargs> is an optional JSON object of keyword arguments for the
+    command's run(). One line is emitted per job: 'OK\t<output>' or
+    'ERR\t<output>\t<message>'.
+    """
+    exit_code = 0
+
+    for line in sys.stdin:
+        line = line.rstrip("\n")
+        if not line.strip():
+            continue
+
+        parts = line.split("\t")
+        if len(parts) < 3:
+            print(f"ERR\t\tMalformed batch line: {line}", flush=True)
+            exit_code = 1
+            continue
+
+        command, input_path, output_path = parts[0], parts[1], parts[2]
+        kwargs = {}
+        if len(parts) > 3 and parts[3]:
+            try:
+                kwargs = json.loads(parts[3])
+            except ValueError as e:
+                print(f"ERR\t{output_path}\tInvalid kwargs JSON: {e}", flush=True)
+                exit_code = 1
+                continue
+
+        try:
+            if command == "transcribe":
+                from scripts import transcribe
+
+                kwargs.setdefault("model_size", "large-v3")
+                kwargs["device"], kwargs["compute_type"] = (
+                    transcribe._resolve_device(
+                        kwargs.get("device"),
+                        kwargs.get("compute_type", "auto"),
+                    )
+                )
+                kwargs["model"] = _get_model(
+                    kwargs["model_size"], kwargs["device"], kwargs["compute_type"]
+                )
+                transcribe.run(input_path, output_path, **kwargs)
+            elif command == "noise-reduce":
+                from scripts import noisereduction
+
+                noisereduction.run(input_path, output_path, **kwargs)
+            elif command == "spectral-subtract":
+                from scripts import spectralsub
+
+                spectralsub.run(input_path, output_path, **kwargs)
+            else:
+                raise ValueError(f"Unknown batch command: {command}")
+            # run() reports a missing input by writing ERROR| to stderr and
+            # returning; don't claim OK for a job that produced nothing
+            if not Path(output_path).exists():
+                raise RuntimeError("no output produced (see stderr)")
+            print(f"OK\t{output_path}", flush=True)
+        except SystemExit as e:
+            # noisereduction/spectralsub run() sys.exit(1) on processing
+            # errors after writing their ERROR| line; keep the batch going
+            print(f"ERR\t{output_path}\tprocessing failed (exit {e.code})",
+                  flush=True)
+            exit_code = 1
+        except Exception as e:
+            print(f"ERR\t{output_path}\t{e}", flush=True)
+            exit_code = 1
+
+    return exit_code
+
+def resolve_compute_type(device: str, compute_type: str = None) -> str:
+    """
+    Resolve the compute type for the given device.
+
+    If the user passed an explicit --compute-type, it is used as-is (with a
+    warning for plain int8 on CUDA, which many GPUs reject or run slower
+    than the mixed kernels). Otherwise 'auto' lets CTranslate2 pick the
+    fastest type the hardware supports at load time — fp16 tensor cores on
+    Ampere+, int8 on VNNI CPUs — instead of probing here.
+    """
+    if compute_type is not None:
+        compute_type = compute_type.replace("-", "_")
+        if device == "cuda" and compute_type == "int8":
+            print(
+                "Warning: compute_type 'int8' on CUDA is usually slower "
+                "than 'int8_float16' or 'auto'",
+                file=sys.stderr
+            )
+        return compute_type
+
+    return "auto"
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Build the CLI parser once per process.
+
+    Construction allocates ~30 argument/subparser objects; library callers
+    that invoke main() repeatedly (tests, embedding) reuse the instance.
+    """
     parser = argparse.ArgumentParser(
         prog="dividr-tools",
         description="DiviDr unified media processing tools"
@@ -49,8 +324,9 @@ def main():
     )
     transcribe_parser.add_argument(
         "--output",
-        required=True,
-        help="Path to output JSON file (use '-' for stdout)"
+        default=None,
+        help="Path to output JSON file (use '-' for stdout); required "
+             "unless --input is a glob pattern, which uses --outputs-dir"
     )
     transcribe_parser.add_argument(
         "--model",
@@ -70,15 +346,18 @@ def main():
     )
     transcribe_parser.add_argument(
         "--device",
-        choices=["cpu", "cuda"],
-        default="cpu",
-        help="Device to use (default: cpu)"
+        choices=["auto", "cpu", "cuda"],
+        default="auto",
+        help="Device to use (default: auto — cuda with int8_float16 when "
+             "a GPU is visible, else cpu)"
     )
     transcribe_parser.add_argument(
         "--compute-type",
-        choices=["int8", "int16", "float16", "float32"],
-        default="int8",
-        help="Compute type (default: int8)"
+        choices=["auto", "int8", "int8_float16", "int8_bfloat16", "int16",
+                 "float16", "bfloat16", "float32"],
+        default=None,
+        help="Compute type (default: auto — CTranslate2 picks the fastest "
+             "supported on the device)"
     )
     transcribe_parser.add_argument(
         "--beam-size",
@@ -91,6 +370,11 @@ def main():
         action="store_true",
         help="Disable voice activity detection"
     )
+    transcribe_parser.add_argument(
+        "--outputs-dir",
+        default=None,
+        help="Directory for output files when --input is a glob pattern"
+    )
 
     # =========================================================================
     # Noise-reduce subcommand
@@ -106,8 +390,16 @@ def main():
     )
     noise_parser.add_argument(
         "--output",
-        required=True,
-        help="Path to output audio file (.wav format)"
+        default=None,
+        help="Path to output audio file (.wav format); required unless "
+             "--input is a glob pattern, which uses --outputs-dir"
+    )
+    noise_parser.add_argument(
+        "--method",
+        choices=["deepfilternet", "spectral-subtract"],
+        default="deepfilternet",
+        help="Denoising method: DeepFilterNet (default, most accurate) or "
+             "the lightweight numpy spectral-subtraction fallback"
     )
     noise_parser.add_argument(
         "--stationary",
@@ -133,6 +425,31 @@ def main():
         default=2048,
         help="FFT window size (default: 2048)"
     )
+    noise_parser.add_argument(
+        "--device",
+        choices=["cpu", "cuda"],
+        default="cpu",
+        help="Device to use (default: cpu)"
+    )
+    noise_parser.add_argument(
+        "--outputs-dir",
+        default=None,
+        help="Directory for output files when --input is a glob pattern"
+    )
+
+    # =========================================================================
+    # Batch subcommand
+    # =========================================================================
+    subparsers.add_parser(
+        "batch",
+        help="Process jobs from stdin (one '<command>\\t<input>\\t<output>[\\t<json_kwargs>]' per line)"
+    )
+
+    return parser
+
+
+def main():
+    parser = _build_parser()
 
     # Parse arguments
     args = parser.parse_args()
@@ -141,14 +458,35 @@ def main():
         parser.print_help()
         sys.exit(1)
 
+    # Glob inputs fan out via --outputs-dir; single inputs need --output.
+    # Validated here so the parser can leave --output optional for globs.
+    if args.command in ("transcribe", "noise-reduce"):
+        if "*" in args.input:
+            if not args.outputs_dir:
+                parser.error(
+                    f"{args.command}: --outputs-dir is required when "
+                    "--input is a glob pattern"
+                )
+        elif not args.output:
+            parser.error(
+                f"{args.command}: --output is required for a single input"
+            )
+
     # Route to appropriate handler
     try:
         if args.command == "transcribe":
+            from scripts import transcribe
+
+            # "auto" becomes the None sentinel: transcribe picks cuda with
+            # int8_float16 when a GPU is visible, cpu otherwise
+            if args.device == "auto":
+                args.device = None
+
             # Build kwargs for transcribe
             transcribe_kwargs = {
                 "model_size": args.model,
                 "device": args.device,
-                "compute_type": args.compute_type.replace("-", "_"),
+                "compute_type": resolve_compute_type(args.device, args.compute_type),
                 "beam_size": args.beam_size,
                 "vad_filter": not args.no_vad,
             }
@@ -157,21 +495,141 @@ def main():
             if args.translate:
                 transcribe_kwargs["translate"] = True
 
+            # Glob input: fan out over a process pool
+            if "*" in args.input:
+                sys.exit(run_glob(
+                    "transcribe", args.input, args.outputs_dir, transcribe_kwargs
+                ))
+
             # Handle stdout output (--output -)
             if args.output == "-":
-                # Call transcribe_audio directly and print RESULT| to stdout
-                result = transcribe.transcribe_audio(args.input, **transcribe_kwargs)
-                result_json = json.dumps(result)
-                print(f"RESULT|{result_json}", flush=True)
+                # Stream segments as they are decoded instead of building the
+                # whole result in memory: one SEGMENT|{json} line per segment,
+                # then a final RESULT|{json} with everything but the segments
+                # (the consumer re-assembles them). PROGRESS| lines are
+                # emitted alongside — the Electron runner's UI progress comes
+                # only from those, not from the SEGMENT| stream.
+                import time
+
+                emit_line(b"PROGRESS|", {
+                    "stage": "loading",
+                    "progress": 0,
+                    "message": f"Loading {args.model} model..."
+                })
+
+                start_time = time.time()
+                info, segments = transcribe.transcribe_audio_iter(
+                    args.input, **transcribe_kwargs
+                )
+
+                emit_line(b"PROGRESS|", {
+                    "stage": "processing",
+                    "progress": 20,
+                    "message": f"Language: {info.language} "
+                               f"({info.language_probability:.1%} confidence)"
+                })
+
+                total_duration = getattr(info, "duration", 0) or 0
+                last_emit_time = 0.0
+                last_progress_pct = -1
+                segment_count = 0
+                duration = 0.0
+                text_parts = []
+                for segment_obj in segments:
+                    segment_count += 1
+                    duration = segment_obj["end"]
+                    text_parts.append(segment_obj["text"])
+                    emit_line(b"SEGMENT|", segment_obj)
+
+                    # Same call-site throttle as transcribe_audio's loop
+                    if total_duration > 0:
+                        progress = 20 + (duration / total_duration) * 70
+                        now = time.monotonic()
+                        if (now - last_emit_time > 0.1
+                                or int(progress) != last_progress_pct):
+                            last_emit_time = now
+                            last_progress_pct = int(progress)
+                            emit_line(b"PROGRESS|", {
+                                "stage": "processing",
+                                "progress": progress,
+                                "message": f"Processed {segment_count} segments..."
+                            })
+
+                emit_line(b"PROGRESS|", {
+                    "stage": "complete",
+                    "progress": 100,
+                    "message": f"Transcription complete! {segment_count} segments"
+                })
+
+                elapsed_time = time.time() - start_time
+                result = {
+                    "success": True,
+                    "streamed": True,
+                    "language": info.language,
+                    "language_probability": round(info.language_probability, 3),
+                    "duration": round(duration, 3),
+                    "text": " ".join(text_parts),
+                    "processing_time": round(elapsed_time, 2),
+                    "model": args.model,
+                    "device": args.device or "auto",
+                    "segment_count": segment_count
+                }
+                if duration > 0:
+                    rtf = elapsed_time / duration
+                    result["real_time_factor"] = round(rtf, 3)
+                    result["faster_than_realtime"] = bool(rtf < 1.0)
+                emit_result(result)
             else:
                 # Save to file using run()
                 transcribe.run(args.input, args.output, **transcribe_kwargs)
 
         elif args.command == "noise-reduce":
-            noisereduction.run(
-                args.input,
-                args.output
-            )
+            method = args.method
+            if method == "deepfilternet":
+                # noisereduction imports torch lazily, so probe for the df
+                # stack without paying its import cost; when it is not
+                # installed the numpy-only fallback still works
+                import importlib.util
+
+                if importlib.util.find_spec("df") is None:
+                    print(
+                        "DeepFilterNet unavailable, falling back to "
+                        "spectral subtraction",
+                        file=sys.stderr, flush=True
+                    )
+                    method = "spectral-subtract"
+                else:
+                    from scripts import noisereduction
+
+            if method == "spectral-subtract":
+                from scripts import spectralsub
+
+                options = {
+                    "prop_decrease": args.prop_decrease,
+                    "n_fft": args.n_fft,
+                    "stationary": args.stationary,
+                }
+                # Glob input: fan out over a process pool
+                if "*" in args.input:
+                    sys.exit(run_glob(
+                        "spectral-subtract", args.input, args.outputs_dir,
+                        options
+                    ))
+                spectralsub.run(args.input, args.output, **options)
+            else:
+                # Glob input: fan out over a process pool
+                if "*" in args.input:
+                    sys.exit(run_glob(
+                        "noise-reduce", args.input, args.outputs_dir,
+                        {"device": args.device}
+                    ))
+                noisereduction.run(
+                    args.input,
+                    args.output,
+                    device=args.device
+                )
+        elif args.command == "batch":
+            sys.exit(run_batch())
         else:
             print(f"Unknown command: {args.command}", file=sys.stderr)
             sys.exit(1)
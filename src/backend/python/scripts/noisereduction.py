@@ -1,35 +1,140 @@
-import argparse
+from __future__ import annotations
+
+import json
 import os
-from typing import Union
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Union
+
+# NOTE: torch, torchaudio and df are imported lazily inside the functions
+# that need them. They cost ~1.5 s and a large RSS to import, which --help
+# and availability probes should not pay for.
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+    from torch import Tensor
+
+# The CUDA caching allocator reads this when it initializes, so it has to be
+# set before torch touches the GPU. expandable_segments lets the allocator
+# grow segments instead of fragmenting on the variable-length chunk tensors,
+# and max_split_size_mb stops large cached blocks from being carved up into
+# pieces that can never serve a chunk-sized request again.
+os.environ.setdefault(
+    "PYTORCH_CUDA_ALLOC_CONF",
+    "expandable_segments:True,max_split_size_mb:128",
+)
+
+# OpenMP/MKL pools also size themselves at library init. Left alone they
+# spawn one thread per core, which for the small per-frame kernels here means
+# cache thrashing on many-core CPUs rather than speedup; torch's own intra-op
+# pool (capped in _configure_torch) does the useful parallelism.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
+# Writer selection, decided once at import: when soundfile is present it is
+# the known-good writer, so saves skip the torchaudio.save attempt (and the
+# wasted encode on backends where it fails) entirely.
+try:
+    import soundfile as _sf
+    _USE_SF = True
+except ImportError:
+    _sf = None
+    _USE_SF = False
+
+_torch_configured = False
+
+
+def _configure_torch(torch) -> None:
+    """One-time torch runtime configuration, applied on first use."""
+    global _torch_configured
+    if _torch_configured:
+        return
+
+    # Tensor-core setup: 'high' lets float32 matmuls run as TF32 on Ampere+
+    # (CPU is unaffected), and cudnn.benchmark picks the fastest conv
+    # algorithms for the fixed chunk shape after the first call.
+    torch.set_float32_matmul_precision('high')
+    torch.backends.cudnn.benchmark = True
+
+    # CPU inference stops scaling past a few threads for these kernel sizes;
+    # beyond that extra threads just contend for cache
+    torch.set_num_threads(min(4, os.cpu_count() or 1))
+
+    _torch_configured = True
 
-import torch
-import torchaudio as ta
-import numpy as np
-from numpy import ndarray
-from torch import Tensor
 
-from df.enhance import enhance, init_df, load_audio
+# Length of each processing chunk in seconds. Enhancing the waveform in
+# fixed-size chunks keeps DeepFilterNet's working set (STFT buffers, model
+# activations) bounded instead of growing with the file duration.
+CHUNK_SECONDS = 10
+
+# Seconds of overlap between consecutive chunks. Hard chunk boundaries force
+# DeepFilterNet's stateful STFT/look-ahead windows to re-warm on every chunk
+# and click at the seams; consecutive chunks instead overlap by this much and
+# the seam is Hann-crossfaded.
+OVERLAP_SECONDS = 0.48
+
+# Chunks whose RMS sits below this level (dBFS) are passed through unchanged
+# instead of being run through the model: there is nothing audible to
+# denoise, and long silent stretches are common in screen recordings.
+SILENCE_THRESHOLD_DBFS = -60.0
+
+# Minimum interval between PROGRESS| lines. Each flushed line is a syscall
+# through the stdout pipe; rapid per-chunk updates get debounced, the final
+# (100%) update is always written.
+_PROGRESS_MIN_INTERVAL = 0.05
+_last_progress_emit = 0.0
+
+
+def log_progress(stage: str, progress: float, message: str = ""):
+    """
+    Send progress updates to stdout in JSON format
+    Format: PROGRESS|{json_data}
+
+    Updates arriving faster than _PROGRESS_MIN_INTERVAL are dropped, except
+    for the terminal 100% update.
+    """
+    global _last_progress_emit
+
+    now = time.monotonic()
+    if progress < 100 and now - _last_progress_emit < _PROGRESS_MIN_INTERVAL:
+        return
+    _last_progress_emit = now
+
+    progress_data = {
+        "stage": stage,
+        "progress": min(100, max(0, progress)),
+        "message": message
+    }
+    print(f"PROGRESS|{json.dumps(progress_data)}", flush=True)
 
 
 def save_audio_with_fallback(
     file: str,
     audio: Union[Tensor, ndarray],
     sr: int,
-    dtype=torch.float32,
+    dtype=None,
 ):
     """
     Save audio with soundfile fallback for better compatibility.
-    
+
     This function ensures audio is saved correctly even if torchaudio.save()
     fails, by falling back to soundfile.write(). This prevents distortion
     issues that can occur with different torchaudio versions.
-    
+
     Args:
         file: Output file path
         audio: Audio tensor/array of shape [C, T]
         sr: Sample rate
-        dtype: Output dtype (torch.float32 recommended to avoid conversion issues)
+        dtype: Output dtype; defaults to torch.float32, which avoids
+               conversion issues
     """
+    import torch
+
+    if dtype is None:
+        dtype = torch.float32
+
     audio = torch.as_tensor(audio)
     if audio.ndim == 1:
         audio = audio.unsqueeze(0)
@@ -37,30 +142,40 @@ def save_audio_with_fallback(
     # Ensure float32 format for saving (prevents int16 conversion distortion)
     if dtype == torch.float32 and audio.dtype != torch.float32:
         if audio.dtype == torch.int16:
-            audio = audio.to(torch.float32) / (1 << 15)
+            # mul_ scales the freshly-cast tensor in place — one memory
+            # pass instead of cast-then-divide allocating twice; contiguous
+            # input keeps the cast on ATen's vectorized path
+            audio = audio.contiguous().to(torch.float32).mul_(1.0 / (1 << 15))
         else:
             audio = audio.to(torch.float32)
     
-    # Try torchaudio.save, fallback to soundfile if it fails
-    try:
-        ta.save(file, audio, sr)
-    except (ImportError, RuntimeError, AttributeError) as e:
-        # Fallback to soundfile for saving (more reliable for float32 audio)
-        import soundfile as sf
-        
-        # Convert tensor to numpy: [C, T] -> [T, C]
-        audio_np = audio.t().cpu().numpy()
-        if audio_np.shape[1] == 1:
-            audio_np = audio_np.squeeze(1)  # Remove channel dimension if mono
-        
-        # Ensure values are in valid range for soundfile
-        audio_np = np.clip(audio_np, -1.0, 1.0)
-        
-        sf.write(file, audio_np, sr, subtype='PCM_32')  # Use 32-bit float
+    # A CUDA tensor has to come host-side exactly once for either writer
+    if audio.is_cuda:
+        audio = audio.cpu()
 
+    if _USE_SF:
+        # soundfile is the known-good writer; go straight to it instead of
+        # attempting ta.save and paying a wasted encode where it fails.
+        # Zero-copy views onto the tensor's storage: [C, T] -> mono [T] or
+        # transposed [T, C]; .t().cpu().numpy() would materialize a copy.
+        audio_np = audio.numpy()
+        if audio_np.shape[0] == 1:
+            audio_np = audio_np[0]  # Drop channel dimension if mono
+        else:
+            audio_np = audio_np.T
+
+        # No clip pass here: run() has already normalized/clamped the
+        # waveform to [-1, 1] before saving, so another O(T) pass over the
+        # buffer would be pure double work.
+
+        # FLOAT stores the float32 samples as-is instead of having
+        # libsndfile requantize the whole buffer to integer PCM.
+        _sf.write(file, audio_np, sr, format='WAV', subtype='FLOAT')
+    else:
+        import torchaudio as ta
+
+        ta.save(file, audio, sr)
 
-import sys
-from pathlib import Path
 
 def get_df_model_path() -> str:
     """
@@ -76,44 +191,313 @@ def get_df_model_path() -> str:
             # print(f"[DEBUG] Using bundled DeepFilterNet model at: {bundled_model_path}", file=sys.stderr)
             return str(bundled_model_path)
         else:
-            print(f"ERROR|Bundled DeepFilterNet assets not found at: {bundled_model_path}", file=sys.stderr)
-            # Fail hard if we expect to be standalone but assets are missing
+            # Fail hard if we expect to be standalone but assets are missing;
+            # run()'s error handler writes the single ERROR| line to stderr
             raise FileNotFoundError(f"Bundled assets missing: {bundled_model_path}")
             
     return None  # Let init_df use default logic (system cache)
 
-def run(input_path: str, output_path: str) -> None:
+def _decode_audio(input_path: str, sr: int) -> Tensor:
+    """
+    Decode the input as [C, T] float32 at the model sample rate.
+
+    torchaudio's StreamReader (FFmpeg) resamples during decode, so a
+    non-48kHz source never materializes at its native rate before a separate
+    resampling pass the way load_audio's decode-then-resample does. Falls
+    back to df's load_audio for containers FFmpeg can't open.
+    """
+    import torch
+
+    try:
+        from torchaudio.io import StreamReader
+
+        reader = StreamReader(input_path)
+        reader.add_basic_audio_stream(
+            frames_per_chunk=CHUNK_SECONDS * sr,
+            sample_rate=sr,
+            format="fltp",
+        )
+
+        parts = [chunk for (chunk,) in reader.stream() if chunk is not None]
+        if not parts:
+            raise RuntimeError("No audio frames decoded")
+
+        # StreamReader yields [T, C]; the enhance pipeline wants [C, T]
+        return torch.cat(parts).t().contiguous()
+    except Exception:
+        from df.enhance import load_audio
+
+        audio, _ = load_audio(input_path, sr=sr)
+        return audio
+
+
+# Initialized (model, df_state, on_gpu) per resolved device. Keeping the
+# enhancer here means repeated run() calls in one process — server and batch
+# modes — pay the weight load, torch.compile and warm-up exactly once.
+_enhancer_cache = {}
+
+
+def load_enhancer(device: str = "cpu", report_progress=log_progress):
+    """
+    Load (or reuse) the DeepFilterNet enhancer for the given device.
+
+    Returns (model, df_state, on_gpu); on_gpu reflects whether the model
+    actually landed on CUDA. Results are cached per resolved device.
+    """
+    import torch
+    from df.enhance import enhance, init_df
+
+    _configure_torch(torch)
+
+    on_gpu = device == "cuda" and torch.cuda.is_available()
+    key = "cuda" if on_gpu else "cpu"
+    cached = _enhancer_cache.get(key)
+    if cached is not None:
+        return cached
+
+    model_path = get_df_model_path()
+
+    # init_df(model_base_dir=...) allows loading from a specific directory
+    # If model_path is None, it defaults to looking in system cache/downloading
+    model, df_state, _ = init_df(default_model='DeepFilterNet2',
+                                 model_base_dir=model_path)
+
+    if on_gpu:
+        model = model.to("cuda")
+    model = model.eval()
+
+    if on_gpu and hasattr(torch, "compile"):
+        # enhance() dispatches many small ops per chunk; reduce-overhead
+        # captures them into CUDA graphs so per-op launch cost goes away.
+        # One dummy chunk is run up front so the compile (and the
+        # cudnn.benchmark algorithm search) happens before the first real
+        # chunk's progress is reported.
+        model = torch.compile(model, mode="reduce-overhead",
+                              fullgraph=False)
+        report_progress("loading", 5, "Warming up model...")
+        warmup = torch.zeros((1, CHUNK_SECONDS * df_state.sr()),
+                             device="cuda")
+        with torch.inference_mode(), \
+                torch.autocast("cuda", dtype=torch.float16):
+            enhance(model, df_state, warmup)
+        del warmup
+
+    _enhancer_cache[key] = (model, df_state, on_gpu)
+    return _enhancer_cache[key]
+
+
+def run(input_path: str, output_path: str, device: str = "cpu",
+        on_progress=None) -> None:
     """
     Apply noise reduction to an audio file using DeepFilterNet.
-    
+
     Uses DeepFilterNet2 model with explicit path resolution for standalone support.
+    When device is 'cuda' and a GPU is available, inference runs on the GPU.
+
+    Args:
+        input_path: Input audio file path
+        output_path: Output audio file path
+        device: 'cpu' or 'cuda'
+        on_progress: Optional callback(stage, progress, message). When set,
+                     progress goes only to the callback and the stdout
+                     PROGRESS| lines are suppressed (library embedding).
     """
+    def report_progress(stage: str, progress: float, message: str = ""):
+        if on_progress is not None:
+            on_progress(stage, progress, message)
+        else:
+            log_progress(stage, progress, message)
+
     if not os.path.exists(input_path):
-        print(f"ERROR|Input file not found: {input_path}", file=sys.stderr)
+        sys.stderr.write(f"ERROR|Input file not found: {input_path}\n")
+        sys.stderr.flush()
         return
 
+    import torch
+    from df.enhance import enhance
+
+    _configure_torch(torch)
+
     try:
-        # Step 1: Model Initialization
-        model_path = get_df_model_path()
-        
-        # init_df(model_base_dir=...) allows loading from a specific directory
-        # If model_path is None, it defaults to looking in system cache/downloading
-        model, df_state, _ = init_df(default_model='DeepFilterNet2', model_base_dir=model_path)
-        
-        # Step 2: Audio Loading
-        audio, _ = load_audio(input_path, sr=df_state.sr())
-        
+        # Step 1: Model Initialization (cached across calls in this process).
+        # Precision is handled by autocast at the enhance() call sites rather
+        # than by casting the weights, so numerically sensitive ops stay in
+        # float32.
+        model, df_state, on_gpu = load_enhancer(device, report_progress)
+
+        # Step 2: Audio Loading (decoded straight at the model rate)
+        audio = _decode_audio(input_path, df_state.sr())
+
         # Step 3: Process with DeepFilterNet
-        enhanced = enhance(model, df_state, audio)
+        # Long files are processed in fixed-size chunks so peak memory stays
+        # proportional to the chunk length rather than the file duration.
+        def enhance_all(model):
+            chunk_size_samples = CHUNK_SECONDS * df_state.sr()
+            total_samples = audio.shape[-1]
+
+            silence_floor = 10.0 ** (SILENCE_THRESHOLD_DBFS / 20.0)
+
+            def enhance_chunk(chunk):
+                # DeepFilterNet's own per-frame SNR gate isn't reachable
+                # through enhance(); gating whole chunks on RMS catches the
+                # common case — long silent stretches — at the cost of one
+                # cheap reduction per chunk
+                if chunk.pow(2).mean().sqrt().item() < silence_floor:
+                    return chunk
+                return enhance(model, df_state, chunk)
+
+            if total_samples <= chunk_size_samples:
+                chunk = audio.to("cuda", non_blocking=True) if on_gpu else audio
+                return enhance_chunk(chunk)
+
+            overlap_samples = int(OVERLAP_SECONDS * df_state.sr())
+            stride = chunk_size_samples - overlap_samples
+            num_chunks = 1 + -(-(total_samples - chunk_size_samples) // stride)
+
+            # Enhanced chunks are written straight into one preallocated
+            # output tensor; list-append plus torch.cat would allocate a
+            # second full-length tensor and copy every sample once more.
+            # Allocation is deferred to the first chunk so dtype/device
+            # follow whatever enhance() returns, and the buffer is trimmed
+            # at the end in case model padding shortens a chunk.
+            enhanced_out = None
+            write_pos = 0
+            fade_in = None
+
+            def write_chunk(chunk):
+                nonlocal enhanced_out, write_pos, fade_in
+                if enhanced_out is None:
+                    enhanced_out = torch.empty(
+                        (chunk.shape[0], total_samples),
+                        dtype=chunk.dtype, device=chunk.device)
+                    # Periodic Hann halves are exactly complementary:
+                    # fade_in + (1 - fade_in) == 1 across the whole seam
+                    fade_in = torch.hann_window(
+                        2 * overlap_samples, periodic=True,
+                        dtype=chunk.dtype, device=chunk.device
+                    )[:overlap_samples]
+                    end = min(chunk.shape[-1], total_samples)
+                    enhanced_out[:, :end].copy_(chunk[:, :end],
+                                                non_blocking=True)
+                    write_pos = end
+                    return
+
+                # Crossfade the overlap with what the previous chunk wrote.
+                # The new chunk's warm-up samples sit at the start of the
+                # fade-in where their weight is ~0, so chunk ramp-up never
+                # reaches the output at full level.
+                ov = min(overlap_samples, chunk.shape[-1], write_pos)
+                start = write_pos - ov
+                seam = enhanced_out[:, start:write_pos]
+                seam.mul_(1.0 - fade_in[:ov])
+                seam.add_(chunk[:, :ov] * fade_in[:ov])
+
+                rest_end = min(write_pos + chunk.shape[-1] - ov, total_samples)
+                if rest_end > write_pos:
+                    enhanced_out[:, write_pos:rest_end].copy_(
+                        chunk[:, ov:ov + rest_end - write_pos],
+                        non_blocking=True)
+                write_pos = rest_end
+
+            if on_gpu:
+                # Pinned host buffer plus a dedicated copy stream: while
+                # chunk i is enhanced on the current stream, chunk i+1's
+                # host-to-device copy runs on the copy stream, hiding the
+                # PCIe transfer behind compute. Events order the two
+                # streams per chunk.
+                audio_host = audio.pin_memory()
+                copy_stream = torch.cuda.Stream()
+
+                def prefetch(i):
+                    start_idx = i * stride
+                    end_idx = min(start_idx + chunk_size_samples, total_samples)
+                    with torch.cuda.stream(copy_stream):
+                        gpu_chunk = audio_host[:, start_idx:end_idx].to(
+                            "cuda", non_blocking=True)
+                    ready = torch.cuda.Event()
+                    ready.record(copy_stream)
+                    return gpu_chunk, ready
+
+                next_chunk = prefetch(0)
+                for i in range(num_chunks):
+                    audio_chunk, ready = next_chunk
+                    if i + 1 < num_chunks:
+                        next_chunk = prefetch(i + 1)
+                    torch.cuda.current_stream().wait_event(ready)
+
+                    write_chunk(enhance_chunk(audio_chunk))
+
+                    # Drop the chunk reference as soon as it is consumed so
+                    # its GPU block returns to the allocator this iteration,
+                    # and hand unused cached blocks back to the driver every
+                    # few chunks — on long files the cache otherwise holds
+                    # the high-water mark for the whole run.
+                    del audio_chunk
+                    if (i + 1) % 8 == 0:
+                        torch.cuda.empty_cache()
+
+                    report_progress(
+                        "processing",
+                        10 + ((i + 1) / num_chunks) * 80,
+                        f"Processed chunk {i + 1}/{num_chunks}"
+                    )
+            else:
+                for i in range(num_chunks):
+                    start_idx = i * stride
+                    end_idx = min(start_idx + chunk_size_samples, total_samples)
+                    audio_chunk = audio[:, start_idx:end_idx]
+
+                    write_chunk(enhance_chunk(audio_chunk))
+
+                    report_progress(
+                        "processing",
+                        10 + ((i + 1) / num_chunks) * 80,
+                        f"Processed chunk {i + 1}/{num_chunks}"
+                    )
+
+            return enhanced_out[:, :write_pos]
+
+        try:
+            # inference_mode drops autograd bookkeeping entirely; autocast
+            # runs the convolutions/GRUs in fp16 on tensor cores while
+            # keeping reductions in float32 (no-op on CPU via enabled=)
+            with torch.inference_mode(), \
+                    torch.autocast("cuda", dtype=torch.float16,
+                                   enabled=on_gpu):
+                enhanced = enhance_all(model)
+        except RuntimeError:
+            if not on_gpu:
+                raise
+            # Mixed-precision GPU inference can fail on some driver/card
+            # combinations (or plain OOM); retry once on the CPU in float32.
+            # The broken CUDA enhancer is evicted so later calls in this
+            # process don't walk into the same failure.
+            report_progress("processing", 10,
+                            "GPU inference failed, retrying on CPU")
+            _enhancer_cache.pop("cuda", None)
+            torch.cuda.empty_cache()
+            model, df_state, on_gpu = load_enhancer("cpu", report_progress)
+            with torch.inference_mode():
+                enhanced = enhance_all(model)
         
-        # Step 4: Normalize audio to prevent clipping and distortion
-        max_val = torch.abs(enhanced).max()
+        # Bring the result back to CPU for normalization and saving. The
+        # clone also detaches the inference-mode tensor so the in-place ops
+        # downstream (clip during save) are allowed.
+        if enhanced.is_cuda:
+            enhanced = enhanced.cpu()
+        enhanced = enhanced.clone()
+
+        # Step 4: Normalize audio to prevent clipping and distortion.
+        # The inf-norm is the abs-max as a single fused reduction — no
+        # materialized abs() tensor — and both fix-ups run in place on the
+        # already-cloned result instead of allocating a full-length copy.
+        max_val = torch.linalg.vector_norm(enhanced, ord=float('inf')).item()
         if max_val > 1.0:
             # Normalize to [-1.0, 1.0] range if it exceeds
-            enhanced = enhanced / max_val
+            enhanced.mul_(1.0 / max_val)
         else:
             # Clip any values that might be slightly outside range
-            enhanced = torch.clamp(enhanced, -1.0, 1.0)
+            enhanced.clamp_(-1.0, 1.0)
         
         # Step 5: Save enhanced audio using custom function with soundfile fallback
         save_audio_with_fallback(output_path, enhanced, df_state.sr(), dtype=torch.float32)
@@ -122,18 +506,67 @@ def run(input_path: str, output_path: str) -> None:
         print(f"RESULT_SAVED|{output_path}", flush=True)
 
     except Exception as e:
-        # Catch and print explicit error for the runner to parse
-        print(f"ERROR|Noise reduction failed: {str(e)}", file=sys.stderr)
-        # Also print detailed traceback to stderr for debugging
         import traceback
-        traceback.print_exc(file=sys.stderr)
+
+        # One write + one flush: the ERROR| line the runner parses, followed
+        # by the traceback for debugging
+        sys.stderr.write(
+            f"ERROR|Noise reduction failed: {str(e)}\n{traceback.format_exc()}"
+        )
+        sys.stderr.flush()
         sys.exit(1)
 
 
+def serve(device: str = "cpu") -> int:
+    """
+    Long-lived worker mode: read '<input>\t<output>' jobs from stdin.
+
+    The model is initialized on the first job and reused for every
+    subsequent one (via load_enhancer's cache), so N short files pay the
+    init_df cost once instead of N times. run() emits its usual
+    RESULT_SAVED|/ERROR| lines per job.
+    """
+    exit_code = 0
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            in_path, out_path = line.split("\t", 1)
+        except ValueError:
+            sys.stderr.write(f"ERROR|Malformed job line: {line}\n")
+            sys.stderr.flush()
+            exit_code = 1
+            continue
+
+        try:
+            run(in_path, out_path, device=device)
+        except SystemExit:
+            # run() already wrote the ERROR| line; keep serving
+            exit_code = 1
+
+    return exit_code
+
+
 if __name__ == "__main__":
+    import argparse
+
     parser = argparse.ArgumentParser(description='Apply noise reduction to audio file')
-    parser.add_argument('input', help='Input audio file path')
-    parser.add_argument('output', help='Output audio file path')
+    parser.add_argument('input', nargs='?', help='Input audio file path')
+    parser.add_argument('output', nargs='?', help='Output audio file path')
+    parser.add_argument('--device', choices=['cpu', 'cuda'], default='cpu',
+                        help='Device to use (default: cpu)')
+    parser.add_argument('--server', action='store_true',
+                        help="Read '<input>\\t<output>' jobs from stdin, "
+                             "loading the model once for all of them")
     args = parser.parse_args()
-    
-    run(args.input, args.output)
+
+    if args.server:
+        sys.exit(serve(device=args.device))
+
+    if not args.input or not args.output:
+        parser.error("input and output are required unless --server is given")
+
+    run(args.input, args.output, device=args.device)
@@ -11,6 +11,7 @@ Run this after installing DeepFilterNet:
 Or integrate into setup scripts.
 """
 
+import ast
 import os
 import sys
 from pathlib import Path
@@ -37,83 +38,95 @@ def find_df_io_path():
     return None
 
 
+def _find_ta_save_stmt(content: str):
+    """
+    Locate the ta.save()/torchaudio.save() statement inside save_audio.
+
+    Returns the ast.Expr node (carrying lineno/end_lineno/col_offset) or
+    None if the file doesn't look like the expected df/io.py.
+    """
+    tree = ast.parse(content)
+
+    save_fn = next(
+        (node for node in ast.walk(tree)
+         if isinstance(node, ast.FunctionDef) and node.name == "save_audio"),
+        None
+    )
+    if save_fn is None:
+        return None
+
+    for node in ast.walk(save_fn):
+        if not (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)):
+            continue
+        func = node.value.func
+        if (isinstance(func, ast.Attribute) and func.attr == "save"
+                and isinstance(func.value, ast.Name)
+                and func.value.id in ("ta", "torchaudio")):
+            return node
+
+    return None
+
+
 def patch_save_audio(io_path: Path):
     """Patch the save_audio function to include soundfile fallback"""
     content = io_path.read_text()
-    
+
     # Check if already patched
     if "soundfile fallback" in content and "sf.write(outpath" in content:
         print(f"✅ {io_path} is already patched")
         return True
-    
-    # Find the save_audio function and add fallback
+
+    # The ast locates the exact save_audio/ta.save statement (robust against
+    # upstream reformatting), then the wrap is a single line-list splice
+    # instead of the old per-line scan with manual indent bookkeeping.
+    stmt = _find_ta_save_stmt(content)
+    if stmt is None:
+        return False
+
     lines = content.split('\n')
-    patched_lines = []
-    in_save_audio = False
-    save_audio_indent = 0
-    found_ta_save = False
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        
-        # Detect start of save_audio function
-        if line.strip().startswith("def save_audio("):
-            in_save_audio = True
-            save_audio_indent = len(line) - len(line.lstrip())
-            patched_lines.append(line)
-            i += 1
-            continue
-        
-        # Detect end of save_audio function
-        if in_save_audio:
-            current_indent = len(line) - len(line.lstrip()) if line.strip() else save_audio_indent + 1
-            if line.strip() and not line.startswith(' ') and not line.startswith('\t'):
-                # Function ended
-                in_save_audio = False
-                found_ta_save = False
-                patched_lines.append(line)
-                i += 1
-                continue
-            
-            # Look for ta.save() call
-            if "ta.save(" in line or "torchaudio.save(" in line:
-                found_ta_save = True
-                patched_lines.append(line)
-                i += 1
-                continue
-            
-            # If we found ta.save, add fallback after it
-            if found_ta_save and line.strip() == "":
-                # Add fallback code
-                indent = " " * (save_audio_indent + 4)
-                patched_lines.append("")
-                patched_lines.append(f"{indent}# Try torchaudio.save, fallback to soundfile if it fails")
-                patched_lines.append(f"{indent}try:")
-                patched_lines.append(f"{indent}    ta.save(outpath, audio, sr)")
-                patched_lines.append(f"{indent}except (ImportError, RuntimeError) as e:")
-                patched_lines.append(f"{indent}    # Fallback to soundfile for saving")
-                patched_lines.append(f'{indent}    if "torchcodec" in str(e).lower() or "backend" in str(e).lower():')
-                patched_lines.append(f'{indent}        import soundfile as sf')
-                patched_lines.append(f'{indent}        logger.debug(f"torchaudio.save failed ({{e}}), using soundfile fallback")')
-                patched_lines.append(f'{indent}        # Convert tensor to numpy: [C, T] -> [T, C]')
-                patched_lines.append(f'{indent}        audio_np = audio.t().numpy()')
-                patched_lines.append(f'{indent}        if audio_np.shape[1] == 1:')
-                patched_lines.append(f'{indent}            audio_np = audio_np.squeeze(1)  # Remove channel dimension if mono')
-                patched_lines.append(f'{indent}        sf.write(outpath, audio_np, sr)')
-                patched_lines.append(f'{indent}    else:')
-                patched_lines.append(f'{indent}        raise')
-                found_ta_save = False
-                patched_lines.append(line)
-                i += 1
-                continue
-        
-        patched_lines.append(line)
-        i += 1
-    
+    start = stmt.lineno - 1   # ast linenos are 1-based
+    end = stmt.end_lineno     # exclusive as a slice bound
+    indent = " " * stmt.col_offset
+
+    wrapped = [
+        f"{indent}# Try torchaudio.save, fallback to soundfile if it fails",
+        f"{indent}try:",
+    ]
+    # Original call (possibly multi-line), re-indented one level into the try
+    wrapped.extend("    " + original for original in lines[start:end])
+    wrapped.extend([
+        f"{indent}except (ImportError, RuntimeError) as e:",
+        f"{indent}    # Fallback to soundfile for saving",
+        f'{indent}    if "torchcodec" in str(e).lower() or "backend" in str(e).lower():',
+        f'{indent}        import soundfile as sf',
+        f'{indent}        logger.debug(f"torchaudio.save failed ({{e}}), using soundfile fallback")',
+        f'{indent}        # Convert tensor to numpy: [C, T] -> [T, C]',
+        f'{indent}        audio_np = audio.t().numpy()',
+        f'{indent}        if audio_np.shape[1] == 1:',
+        f'{indent}            audio_np = audio_np.squeeze(1)  # Remove channel dimension if mono',
+        f'{indent}        sf.write(outpath, audio_np, sr)',
+        f'{indent}    else:',
+        f'{indent}        raise',
+    ])
+
+    lines[start:end] = wrapped
+
     # Write patched content
-    patched_content = '\n'.join(patched_lines)
-    io_path.write_text(patched_content)
+    io_path.write_text('\n'.join(lines))
+
+    # Recompile immediately so the first import of df after patching doesn't
+    # pay the re-parse: drop the now-stale cached bytecode and warm the cache
+    # from the patched source. optimize=-1 compiles at this interpreter's
+    # optimization level, producing the same .pyc name an import will look
+    # for (the app runs unoptimized, so an opt-2 file would never be used).
+    import py_compile
+
+    pycache = io_path.parent / '__pycache__'
+    if pycache.exists():
+        for stale in pycache.glob('io.*.pyc'):
+            stale.unlink(missing_ok=True)
+    py_compile.compile(str(io_path), doraise=True, optimize=-1)
+
     return True
 
 
@@ -0,0 +1,374 @@
+"""
+Spectral-subtraction noise reduction fallback for Dividr
+
+Pure numpy/soundfile implementation used when DeepFilterNet (and its torch
+stack) is not available. Quality is below DeepFilterNet's learned filtering;
+the footprint and startup cost are far lighter.
+
+Can be used as a callable function or CLI script:
+    # As a library function:
+    from spectralsub import run
+    run("noisy.wav", "clean.wav")
+
+    # As a CLI script:
+    python spectralsub.py noisy.wav clean.wav
+"""
+
+import functools
+import os
+import sys
+
+import numpy as np
+import soundfile as sf
+from numpy.lib.stride_tricks import as_strided, sliding_window_view
+
+# FFT backend resolution, fastest available first:
+#   pyFFTW  - FFTW with plan (wisdom) caching; identical plans across the
+#             repeated same-shape transforms here are reused, and transforms
+#             run multithreaded
+#   scipy   - pocketfft: SIMD builds, preserves float32, workers=-1 spreads
+#             batched transforms across cores
+#   numpy   - always present
+# _FFT_KWARGS carries the backend-specific parallelism argument.
+try:
+    import pyfftw
+
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(30)
+    rfft = functools.partial(
+        pyfftw.interfaces.numpy_fft.rfft, threads=os.cpu_count() or 1)
+    irfft = functools.partial(
+        pyfftw.interfaces.numpy_fft.irfft, threads=os.cpu_count() or 1)
+    _FFT_KWARGS = {}
+except ImportError:
+    try:
+        from scipy.fft import rfft, irfft
+        _FFT_KWARGS = {"workers": -1}
+    except ImportError:
+        from numpy.fft import rfft, irfft
+        _FFT_KWARGS = {}
+
+try:
+    from scipy.fft import next_fast_len
+except ImportError:
+    def next_fast_len(target):
+        """Fallback: keep the requested length"""
+        return target
+
+
+# Samples per processing block in run(). The spectrogram is the dominant
+# allocation — (frames, bins) complex64 grows linearly with the signal — so
+# long files are denoised block by block, bounding peak memory by the block
+# size instead of the file duration.
+_BLOCK_SAMPLES = 1 << 20
+
+
+@functools.lru_cache(maxsize=4)
+def _hann_window(n_fft):
+    """Hann window as float32, cached across calls (treat as read-only)"""
+    return np.hanning(n_fft).astype(np.float32)
+
+
+def _overlap_window_sum(win_sq, hop_length, num_frames, padded_len):
+    """
+    Sum of the squared synthesis windows over all overlapping frames.
+
+    For a constant window this sum is periodic in the hop everywhere except
+    the first and last n_fft - hop samples, where fewer frames overlap
+    (COLA). One period is computed in O(n_fft) and tiled across the signal;
+    only the edge regions are accumulated from the actual frames. This
+    replaces a full per-frame accumulation pass over the output length.
+    """
+    n_fft = len(win_sq)
+
+    # One period of the steady-state sum: periodic[t] = sum_k win_sq[t + k*hop]
+    periodic = np.zeros(hop_length, dtype=win_sq.dtype)
+    for k in range(0, n_fft, hop_length):
+        seg = win_sq[k:k + hop_length]
+        periodic[:len(seg)] += seg
+
+    reps = -(-padded_len // hop_length)
+    window_sum = np.tile(periodic, reps)[:padded_len].copy()
+
+    # Head edge: positions before n_fft - hop see fewer frames
+    head_len = min(n_fft - hop_length, padded_len)
+    if head_len > 0:
+        window_sum[:head_len] = 0.0
+        for i in range(-(-head_len // hop_length)):
+            start = i * hop_length
+            seg_len = min(n_fft, head_len - start)
+            if seg_len <= 0:
+                break
+            window_sum[start:start + seg_len] += win_sq[:seg_len]
+
+    # Tail edge: positions from num_frames*hop on see fewer frames. Runs
+    # after the head pass so any overlap (very short signals) ends up exact.
+    tail_start = num_frames * hop_length
+    if tail_start < padded_len:
+        window_sum[tail_start:] = 0.0
+        first = max(0, (tail_start - n_fft) // hop_length + 1)
+        for i in range(first, num_frames):
+            start = i * hop_length
+            end = min(start + n_fft, padded_len)
+            if end <= tail_start:
+                continue
+            ov_start = max(start, tail_start)
+            window_sum[ov_start:end] += win_sq[ov_start - start:end - start]
+
+    return window_sum
+
+
+def estimate_noise_spectrum(audio, sample_rate, n_fft=2048, hop_length=512,
+                            noise_seconds=0.5):
+    """
+    Noise magnitude spectrum averaged over windows of the leading clip.
+
+    Factored out of denoise_with_fft so blockwise callers can estimate the
+    noise once (from the head of the file) and reuse it for every block.
+    """
+    audio = np.ascontiguousarray(audio, dtype=np.float32)
+    if len(audio) < n_fft:
+        return np.zeros(n_fft // 2 + 1, dtype=np.float32)
+
+    window = _hann_window(n_fft)
+    noise_len = max(n_fft, int(sample_rate * noise_seconds))
+    noise_reference = audio[:min(noise_len, len(audio))]
+    noise_frames = sliding_window_view(noise_reference, n_fft)[::hop_length]
+    return np.mean(
+        np.abs(rfft(noise_frames * window, n=n_fft, axis=1, **_FFT_KWARGS)),
+        axis=0, dtype=np.float32)
+
+
+def denoise_with_fft(audio, sample_rate, n_fft=2048, hop_length=512,
+                     alpha=0.8, beta=0.02, noise_seconds=0.5,
+                     noise_spectrum=None):
+    """
+    Spectral subtraction over an STFT of the signal.
+
+    The noise magnitude spectrum is estimated from the leading noise_seconds
+    of the signal; each frame's magnitude is reduced by alpha times that
+    estimate, floored at beta, and the waveform is rebuilt by overlap-add.
+
+    Analysis frames the padded signal once via a strided view and transforms
+    all frames with a single batched rfft, so no Python loop runs per frame
+    on the analysis side.
+
+    Args:
+        audio: 1-D audio signal
+        sample_rate: Sample rate in Hz
+        n_fft: FFT window size
+        hop_length: Hop between frames in samples
+        alpha: Proportion of the noise estimate to subtract (0.0-1.0)
+        beta: Spectral floor, the minimum gain per frequency bin
+        noise_seconds: Length of the leading noise-estimation clip
+        noise_spectrum: Precomputed noise magnitude spectrum (n_fft // 2 + 1
+                        bins); when given, the leading-clip estimation is
+                        skipped
+
+    Returns:
+        Denoised audio signal, same length as the input
+    """
+    # float32 end-to-end: halves the bytes moved through every stage and
+    # makes the batched transforms return complex64 rather than complex128
+    audio = np.ascontiguousarray(audio, dtype=np.float32)
+
+    num_samples = len(audio)
+
+    # Pad once so every frame is full length and the same window applies
+    # uniformly. The half-window edge_pad on each side keeps the COLA edge
+    # regions — where only the tapered tails of a window or two cover each
+    # sample and the squared-window sum is vanishingly small — inside
+    # padding that is trimmed off below. Without it, dividing the head/tail
+    # samples (whose spectral leakage is O(signal), not O(window²)) by that
+    # near-zero sum blew them up into loud clicks at the start of every
+    # output.
+    edge_pad = n_fft // 2
+    covered = num_samples + 2 * edge_pad
+    num_frames = max(0, (max(covered - n_fft, 0) + hop_length - 1) // hop_length) + 1
+    padded_len = (num_frames - 1) * hop_length + n_fft
+    audio_padded = np.pad(audio, (edge_pad, padded_len - num_samples - edge_pad))
+
+    window = _hann_window(n_fft)
+
+    # Noise magnitude estimate, averaged over windows of the leading clip
+    # (batched the same way as the analysis pass below), unless the caller
+    # supplied one. Estimated past the edge padding so the leading zeros
+    # don't bias it low.
+    if noise_spectrum is None:
+        noise_spectrum = estimate_noise_spectrum(
+            audio_padded[edge_pad:], sample_rate, n_fft=n_fft,
+            hop_length=hop_length, noise_seconds=noise_seconds)
+
+    # Analysis: one strided framing + one batched rfft over all frames.
+    # scipy returns complex64 for float32 input; the explicit cast keeps the
+    # spectrogram — the largest array here — at complex64 on the numpy
+    # fallback too, which always computes in double.
+    frames = sliding_window_view(audio_padded, n_fft)[::hop_length]
+    spec = rfft(frames * window, n=n_fft, axis=1, **_FFT_KWARGS).astype(
+        np.complex64, copy=False)
+
+    # Spectral subtraction, vectorized over the whole (frames, bins) array.
+    # Multiplying the complex spectrum by a real gain scales the magnitude
+    # and preserves phase, so there is no angle/exp round trip. The gain is
+    # computed in place in the magnitude buffer via out= so the chain
+    # allocates one (frames, bins) float32 array instead of one per operator.
+    gain = np.abs(spec)
+    np.maximum(gain, 1e-10, out=gain)
+    np.divide(noise_spectrum[np.newaxis, :], gain, out=gain)
+    np.multiply(gain, -alpha, out=gain)
+    np.add(gain, 1.0, out=gain)          # gain = 1 - alpha * noise / mag
+    np.maximum(gain, beta, out=gain)
+    spec *= gain
+
+    # Synthesis: one batched irfft over all frames, windowed by broadcasting,
+    # then weighted overlap-add of the resulting (frames, n_fft) array
+    rec = irfft(spec, n=n_fft, axis=1, **_FFT_KWARGS).astype(
+        np.float32, copy=False) * window
+
+    # Overlap-add without a per-frame Python loop: frames i and i+R never
+    # overlap when R = ceil(n_fft / hop), so frames are split into R
+    # interleaved groups whose supports are disjoint, and each group is
+    # accumulated with one strided array add.
+    denoised_audio = np.zeros(padded_len, dtype=np.float32)
+    win_sq = window * window
+    group_stride = -(-n_fft // hop_length)
+    itemsize = denoised_audio.itemsize
+
+    for r in range(min(group_stride, rec.shape[0])):
+        group = rec[r::group_stride]
+        out_view = as_strided(
+            denoised_audio[r * hop_length:],
+            shape=(group.shape[0], n_fft),
+            strides=(group_stride * hop_length * itemsize, itemsize),
+        )
+        out_view += group
+
+    # The window normalization is known analytically — no accumulation pass
+    window_sum = _overlap_window_sum(win_sq, hop_length, num_frames, padded_len)
+
+    nonzero = window_sum > 1e-10
+    denoised_audio[nonzero] /= window_sum[nonzero]
+
+    return denoised_audio[edge_pad:edge_pad + num_samples]
+
+
+def _read_block(snd, start, stop):
+    """
+    Read frames [start, stop) from an open SoundFile as mono float32.
+
+    dtype='float32' makes libsndfile decode straight into float32 instead of
+    the double default; multichannel input is downmixed with the mean taken
+    into a preallocated float32 buffer.
+    """
+    snd.seek(start)
+    block = snd.read(stop - start, dtype='float32', always_2d=True)
+    if block.shape[1] > 1:
+        mono = np.empty(block.shape[0], dtype=np.float32)
+        np.mean(block, axis=1, out=mono)
+        return mono
+    return block[:, 0]
+
+
+def run(input_path: str, output_path: str, prop_decrease: float = 0.8,
+        n_fft: int = 2048, stationary: bool = True) -> None:
+    """
+    Apply spectral-subtraction noise reduction to an audio file.
+
+    Mirrors noisereduction.run()'s stdout protocol: RESULT_SAVED| on success,
+    an ERROR| line on stderr on failure.
+
+    Note: stationary is accepted for CLI compatibility; the estimator always
+    assumes stationary noise taken from the leading clip.
+    """
+    if not os.path.exists(input_path):
+        sys.stderr.write(f"ERROR|Input file not found: {input_path}\n")
+        sys.stderr.flush()
+        return
+
+    try:
+        with sf.SoundFile(str(input_path)) as snd:
+            sample_rate = snd.samplerate
+            total_frames = snd.frames
+
+            # Cheapest FFT length at or above the requested size (identity
+            # when scipy is unavailable)
+            n_fft = next_fast_len(n_fft)
+            hop_length = n_fft // 4
+
+            # subtype='FLOAT' stores the float32 samples as-is; the default
+            # PCM_16 subtype would have libsndfile requantize every write
+            with sf.SoundFile(str(output_path), 'w',
+                              samplerate=sample_rate, channels=1,
+                              subtype='FLOAT') as out_f:
+                if total_frames <= _BLOCK_SAMPLES:
+                    block = denoise_with_fft(
+                        _read_block(snd, 0, total_frames),
+                        sample_rate,
+                        n_fft=n_fft,
+                        hop_length=hop_length,
+                        alpha=prop_decrease,
+                    )
+                    # Clamp before writing: FLOAT WAV stores samples as-is,
+                    # so any out-of-range reconstruction would play back as
+                    # clipping artifacts downstream
+                    np.clip(block, -1.0, 1.0, out=block)
+                    out_f.write(block)
+                else:
+                    # Long files: only one block (plus context) is ever
+                    # decoded, spectrally processed, and written at a time,
+                    # so peak memory is bounded by the block size rather
+                    # than the file duration. The noise spectrum is
+                    # estimated once from the head of the file; each block
+                    # carries n_fft samples of context on both sides, which
+                    # are denoised and discarded, hiding the block seams.
+                    head_len = min(total_frames,
+                                   max(n_fft, int(sample_rate * 0.5)))
+                    noise_spectrum = estimate_noise_spectrum(
+                        _read_block(snd, 0, head_len), sample_rate,
+                        n_fft=n_fft, hop_length=hop_length)
+                    context = n_fft
+
+                    for start in range(0, total_frames, _BLOCK_SAMPLES):
+                        end = min(start + _BLOCK_SAMPLES, total_frames)
+                        ctx_start = max(0, start - context)
+                        ctx_end = min(total_frames, end + context)
+
+                        block = denoise_with_fft(
+                            _read_block(snd, ctx_start, ctx_end),
+                            sample_rate,
+                            n_fft=n_fft,
+                            hop_length=hop_length,
+                            alpha=prop_decrease,
+                            noise_spectrum=noise_spectrum,
+                        )
+                        np.clip(block, -1.0, 1.0, out=block)
+                        out_f.write(block[start - ctx_start:
+                                          end - ctx_start])
+
+        print(f"RESULT_SAVED|{output_path}", flush=True)
+
+    except Exception as e:
+        import traceback
+
+        sys.stderr.write(
+            f"ERROR|Noise reduction failed: {str(e)}\n{traceback.format_exc()}"
+        )
+        sys.stderr.flush()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Apply spectral-subtraction noise reduction to audio file')
+    parser.add_argument('input', help='Input audio file path')
+    parser.add_argument('output', help='Output audio file path')
+    parser.add_argument('--prop-decrease', type=float, default=0.8,
+                        help='Proportion of noise to reduce (0.0-1.0, default: 0.8)')
+    parser.add_argument('--n-fft', type=int, default=2048,
+                        help='FFT window size (default: 2048)')
+    args = parser.parse_args()
+
+    run(args.input, args.output, prop_decrease=args.prop_decrease,
+        n_fft=args.n_fft)
@@ -13,7 +13,9 @@ Can be used as a callable function or CLI script:
 """
 
 import argparse
+import functools
 import json
+import os
 import sys
 import time
 from pathlib import Path
@@ -33,6 +35,22 @@ except ImportError:
     else:
         WhisperModel = None  # Will raise ImportError when used
 
+# A long transcript serializes to megabytes of JSON; orjson (same optional
+# dependency main.py uses for its stdout lines) does that several times
+# faster than stdlib json and emits bytes directly. Results and the
+# per-line progress/error payloads both route through it when available.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dump_result(result: Dict[str, Any], indent: bool = False) -> bytes:
+    """Serialize a result dict to UTF-8 JSON bytes, pretty-printed if asked."""
+    if orjson is not None:
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(result, indent=2 if indent else None).encode("utf-8")
+
 
 # Custom exceptions for better error handling
 class TranscriptionError(Exception):
@@ -50,17 +68,40 @@ class ModelLoadError(TranscriptionError):
     pass
 
 
+# Minimum interval between PROGRESS| lines, matching noisereduction.py.
+# Every flushed line is a syscall through the stdout pipe and a JSON parse on
+# the Electron side; per-segment updates on long files arrive far faster than
+# the UI repaints, so intermediate ones get debounced.
+_PROGRESS_MIN_INTERVAL = 0.05
+_last_progress_emit = 0.0
+
+
 def log_progress(stage: str, progress: float, message: str = ""):
     """
     Send progress updates to stdout in JSON format
     Format: PROGRESS|{json_data}
+
+    Updates arriving faster than _PROGRESS_MIN_INTERVAL are dropped, except
+    for the terminal 100% update.
     """
+    global _last_progress_emit
+
+    now = time.monotonic()
+    if progress < 100 and now - _last_progress_emit < _PROGRESS_MIN_INTERVAL:
+        return
+    _last_progress_emit = now
+
     progress_data = {
         "stage": stage,
         "progress": min(100, max(0, progress)),
         "message": message
     }
-    print(f"PROGRESS|{json.dumps(progress_data)}", flush=True)
+    # One pre-encoded buffer write instead of print(): skips the f-string
+    # build, the str->bytes encode inside print, and its end-of-line
+    # handling — this runs for every emitted update
+    out = sys.stdout.buffer
+    out.write(b"PROGRESS|" + _dump_result(progress_data) + b"\n")
+    out.flush()
 
 
 def log_error(error_type: str, message: str, details: str = ""):
@@ -71,7 +112,232 @@ def log_error(error_type: str, message: str, details: str = ""):
         "details": details,
         "type": "transcription_error"
     }
-    print(json.dumps(error_data), flush=True)
+    out = sys.stdout.buffer
+    out.write(_dump_result(error_data) + b"\n")
+    out.flush()
+
+
+# Parent directories already created by run(); avoids repeating the
+# stat/mkdir syscalls for every file when many outputs share a directory
+# (batch mode in particular)
+_created_dirs = set()
+
+
+def _ensure_parent_dir(output_file: Path) -> None:
+    """Create the output file's parent directory once per process"""
+    parent = str(output_file.parent)
+    if parent not in _created_dirs:
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        _created_dirs.add(parent)
+
+
+def _segment_to_dict(segment) -> Dict[str, Any]:
+    """Convert a faster-whisper segment to the JSON shape used in results"""
+    # Single comprehension instead of append-in-a-loop: this runs once per
+    # word of the transcript, so the fewer bytecode dispatches the better.
+    # round() stays — 3-decimal timestamps are part of the output contract
+    # and json.dumps offers no float-formatting hook to move it into.
+    words = [
+        {
+            "word": word.word.strip(),
+            "start": round(word.start, 3),
+            "end": round(word.end, 3),
+            "confidence": round(word.probability, 3)
+        }
+        for word in segment.words
+    ] if segment.words else []
+
+    return {
+        "start": round(segment.start, 3),
+        "end": round(segment.end, 3),
+        "text": segment.text.strip(),
+        "words": words
+    }
+
+
+# Loaded models keyed by (model_size, device, compute_type). A model load
+# costs seconds to tens of seconds — far more than transcribing a short clip
+# — so repeated calls in one process (batch modes above all) must reuse the
+# instance. faster-whisper is stateless per transcribe() call, so sharing is
+# safe.
+_MODEL_CACHE: Dict[tuple, "WhisperModel"] = {}
+
+
+@functools.lru_cache(maxsize=2)
+def _decode_audio_cached(path: str, mtime: float):
+    """Decode a file to 16kHz float32 mono via faster-whisper's PyAV path."""
+    from faster_whisper.audio import decode_audio
+    return decode_audio(path, sampling_rate=16000)
+
+
+def _decode_audio(path: str):
+    """
+    Decode audio once and hand model.transcribe the array.
+
+    Passing a path makes faster-whisper decode on every call; decoding here
+    and caching by (path, mtime) means re-transcribing the same file (a
+    different model size, a re-run after a tweak) skips the codec startup
+    and full decode. The cache is small — an hour of 16kHz float32 is
+    ~230MB — so only the two most recent files stay resident.
+
+    Falls back to returning the path untouched if decoding here fails, in
+    which case faster-whisper decodes it internally as before.
+    """
+    try:
+        return _decode_audio_cached(path, os.path.getmtime(path))
+    except Exception:
+        return path
+
+
+def _build_transcribe_kwargs(
+    beam_size: int,
+    language: Optional[str],
+    translate: bool,
+    vad_filter: bool,
+    chunk_length: int = 30,
+    clip_timestamps: Optional[List[float]] = None,
+    condition_on_previous_text: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    Keyword arguments for model.transcribe, shared by transcribe_audio and
+    transcribe_audio_iter so both paths decode identically.
+
+    A 500ms minimum-silence VAD setting cuts silent stretches out of the
+    encoder's input entirely — on talk content with long pauses that removes
+    a proportional fraction of the encoder and mel-FFT work.
+    clip_timestamps narrows the transcription to caller-chosen regions the
+    same way. condition_on_previous_text left at None turns on for
+    greedy-ish decoding (beam_size < 3) where it costs little, off for wide
+    beams where the shorter context is faster per decode step.
+    """
+    if condition_on_previous_text is None:
+        condition_on_previous_text = beam_size < 3
+
+    kwargs: Dict[str, Any] = {
+        "beam_size": beam_size,
+        "language": language,
+        "vad_filter": vad_filter,
+        "word_timestamps": True,  # Enable word-level timestamps
+        "condition_on_previous_text": condition_on_previous_text,
+        "task": "translate" if translate else "transcribe",
+        "chunk_length": chunk_length,
+    }
+    if vad_filter:
+        kwargs["vad_parameters"] = {"min_silence_duration_ms": 500}
+    if clip_timestamps is not None:
+        kwargs["clip_timestamps"] = clip_timestamps
+    return kwargs
+
+
+def _auto_device() -> tuple:
+    """
+    Pick (device, compute_type) for this machine.
+
+    Probes for a visible CUDA device through ctranslate2 — the runtime
+    faster-whisper executes on anyway, so the probe costs no extra import.
+    With a GPU the pick is int8_float16: weight-only int8 with fp16
+    activations, markedly faster than both fp16 and CPU int8 at a fraction
+    of the VRAM. Without one, "auto" lets CTranslate2 choose the best
+    supported CPU kernels.
+    """
+    try:
+        import ctranslate2
+        if ctranslate2.get_cuda_device_count() > 0:
+            return "cuda", "int8_float16"
+    except Exception:
+        pass
+    return "cpu", "auto"
+
+
+def _resolve_device(device: Optional[str], compute_type: str) -> tuple:
+    """Resolve a possibly-None device to a concrete (device, compute_type)."""
+    if device is None:
+        device, auto_compute = _auto_device()
+        if compute_type == "auto":
+            compute_type = auto_compute
+    return device, compute_type
+
+
+def _get_model(
+    model_size: str,
+    device: str,
+    compute_type: str,
+    cpu_threads: int = 0,
+    num_workers: int = 4,
+    model_path: Optional[str] = None,
+) -> "WhisperModel":
+    """Return a cached WhisperModel for the configuration, loading on first use."""
+    key = (model_path or model_size, device, compute_type, cpu_threads, num_workers)
+    model = _MODEL_CACHE.get(key)
+    if model is None:
+        model = load_model(model_size, device, compute_type, cpu_threads,
+                           num_workers, model_path)
+        _MODEL_CACHE[key] = model
+    return model
+
+
+def load_model(
+    model_size: str = "large-v3",
+    device: str = "cpu",
+    compute_type: str = "auto",
+    cpu_threads: int = 0,
+    num_workers: int = 4,
+    model_path: Optional[str] = None,
+) -> "WhisperModel":
+    """
+    Construct a WhisperModel instance.
+
+    Split out of transcribe_audio so callers (e.g. batch mode) can load the
+    model once and reuse it across files.
+
+    compute_type defaults to "auto": CTranslate2 picks the fastest type the
+    hardware supports at load time (fp16 tensor cores on Ampere+, int8 on
+    VNNI CPUs), instead of a hardcoded int8 that some GPUs reject outright.
+
+    model_path, when given, overrides model_size with a local CT2-converted
+    model directory (ct2-transformers-converter output). CTranslate2 loads
+    such a directory mmap-backed — near-instant versus resolving a
+    HuggingFace name, and the weights are already quantized on disk so no
+    conversion happens at load time.
+
+    num_workers does not parallelize a single transcribe() call; it sets how
+    many transcribe() calls the model accepts concurrently (see
+    transcribe_batch). cpu_threads is the per-call intra-op thread count;
+    left at 0 on CPU it is derived as cpu_count // num_workers so concurrent
+    workers split the cores instead of each spawning a thread per core and
+    thrashing the caches.
+
+    Raises:
+        ModelLoadError: If model fails to load
+        ImportError: If faster-whisper is not installed
+    """
+    if WhisperModel is None:
+        raise ImportError(
+            "faster-whisper not installed. Please install: pip install faster-whisper"
+        )
+
+    if device == "cuda" and compute_type == "int8":
+        # Plain int8 is a CPU-oriented type; many GPUs reject it or run it
+        # slower than the mixed kernels
+        print(
+            "Warning: compute_type 'int8' on CUDA is usually slower than "
+            "'int8_float16' or 'auto'",
+            file=sys.stderr
+        )
+
+    if cpu_threads <= 0 and device == "cpu" and num_workers > 1:
+        cpu_threads = max(1, (os.cpu_count() or 1) // num_workers)
+
+    try:
+        return WhisperModel(
+            model_path or model_size,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=max(0, cpu_threads),
+            num_workers=num_workers
+        )
+    except Exception as e:
+        raise ModelLoadError(f"Failed to load model: {str(e)}") from e
 
 
 def transcribe_audio(
@@ -79,11 +345,18 @@ def transcribe_audio(
     model_size: str = "large-v3",
     language: Optional[str] = None,
     translate: bool = False,
-    device: str = "cpu",
-    compute_type: str = "int8",
+    device: Optional[str] = None,
+    compute_type: str = "auto",
     beam_size: int = 5,
     vad_filter: bool = True,
+    chunk_length: int = 30,
+    clip_timestamps: Optional[List[float]] = None,
+    condition_on_previous_text: Optional[bool] = None,
+    cpu_threads: int = 0,
+    num_workers: int = 4,
+    model_path: Optional[str] = None,
     on_progress: Optional[Callable[[str, float, str], None]] = None,
+    model: Optional["WhisperModel"] = None,
 ) -> Dict[str, Any]:
     """
     Transcribe audio file using Faster-Whisper
@@ -96,12 +369,32 @@ def transcribe_audio(
         model_size: Model size (tiny, base, small, medium, large-v3)
         language: Language code (None for auto-detect)
         translate: Translate to English
-        device: cpu or cuda
+        device: cpu, cuda, or None to auto-detect (cuda with int8_float16
+                when a GPU is visible, cpu otherwise)
         compute_type: int8, int16, float16, float32
         beam_size: Beam search size (higher = more accurate but slower)
         vad_filter: Use Voice Activity Detection to filter silence
+        chunk_length: Encoder window length in seconds (default 30, the
+                      model's native window)
+        clip_timestamps: Optional [start, end, start, end, ...] seconds;
+                         only those regions are transcribed
+        condition_on_previous_text: Feed the previous window's text to the
+                                    decoder. None picks a default: on for
+                                    greedy-ish decoding (beam_size < 3)
+                                    where it costs little and helps
+                                    narrative audio, off for wide beams
+                                    where the shorter context is ~10-15%
+                                    faster per decode step
+        cpu_threads: Intra-op threads per transcribe call (0 = derive from
+                     cpu_count and num_workers, see load_model)
+        num_workers: How many concurrent transcribe calls the model accepts
+        model_path: Local CT2-converted model directory; overrides
+                    model_size and loads mmap-backed (see load_model)
         on_progress: Optional callback function(stage, progress, message) for progress updates.
                      If None, uses default stdout logging for CLI compatibility.
+        model: Optional preloaded WhisperModel (see load_model). When given,
+               model_size/device/compute_type are ignored for loading and the
+               instance is reused as-is.
     
     Returns:
         Dictionary with transcription results containing:
@@ -138,7 +431,9 @@ def transcribe_audio(
     
     # Use default progress logging if no callback provided (CLI mode)
     progress_callback = on_progress if on_progress is not None else log_progress
-    
+
+    device, compute_type = _resolve_device(device, compute_type)
+
     # Validate audio file
     audio_file = Path(audio_path)
     if not audio_file.exists():
@@ -153,43 +448,38 @@ def transcribe_audio(
             log_error("invalid_path", error_msg)
         raise FileNotFoundError(error_msg)
     
-    # Log initial progress
-    progress_callback("loading", 0, f"Loading {model_size} model...")
-    
-    try:
-        # Load model
-        load_start = time.time()
-        model = WhisperModel(
-            model_size,
-            device=device,
-            compute_type=compute_type,
-            num_workers=4  # Use multiple CPU cores
-        )
-        load_time = time.time() - load_start
-        
-        progress_callback("loading", 10, f"Model loaded in {load_time:.1f}s")
-        
-    except Exception as e:
-        error_msg = f"Failed to load model: {str(e)}"
-        if on_progress is None:
-            log_error("model_load_error", error_msg, str(e))
-        raise ModelLoadError(error_msg) from e
+    if model is None:
+        # Log initial progress
+        progress_callback("loading", 0, f"Loading {model_size} model...")
+
+        try:
+            # Load model (cached across calls in this process)
+            load_start = time.time()
+            model = _get_model(model_size, device, compute_type,
+                               cpu_threads, num_workers, model_path)
+            load_time = time.time() - load_start
+
+            progress_callback("loading", 10, f"Model loaded in {load_time:.1f}s")
+
+        except (ModelLoadError, ImportError) as e:
+            if on_progress is None:
+                log_error("model_load_error", str(e), str(e))
+            raise
+    else:
+        progress_callback("loading", 10, "Reusing loaded model")
     
     # Start transcription
     progress_callback("processing", 15, "Starting transcription...")
     
     try:
         start_time = time.time()
-        
-        # Transcribe with word-level timestamps
+
         segments_generator, info = model.transcribe(
-            str(audio_file),
-            beam_size=beam_size,
-            language=language,
-            vad_filter=vad_filter,
-            word_timestamps=True,  # Enable word-level timestamps
-            condition_on_previous_text=False,  # Slightly faster and more consistent
-            task="translate" if translate else "transcribe"
+            _decode_audio(str(audio_file)),
+            **_build_transcribe_kwargs(
+                beam_size, language, translate, vad_filter,
+                chunk_length, clip_timestamps, condition_on_previous_text
+            )
         )
         
         # Log detected language
@@ -201,45 +491,45 @@ def transcribe_audio(
         
         # Process segments
         segments_list = []
+        text_parts = []
         segment_count = 0
         total_duration = info.duration if hasattr(info, 'duration') else 0
-        
+
+        # Throttle state for the per-segment updates below. Short segments
+        # can arrive hundreds of times a minute and each callback blocks the
+        # decoder thread (for the default logger: a JSON encode plus a
+        # flushed pipe write); updates that advance neither the clock nor
+        # the whole percent are skipped regardless of which callback is
+        # installed.
+        last_emit_time = 0.0
+        last_progress_pct = -1
+
         for segment in segments_generator:
             segment_count += 1
-            
-            # Build word list with timestamps
-            words = []
-            if segment.words:
-                for word in segment.words:
-                    words.append({
-                        "word": word.word.strip(),
-                        "start": round(word.start, 3),
-                        "end": round(word.end, 3),
-                        "confidence": round(word.probability, 3)
-                    })
-            
-            # Build segment object
-            segment_obj = {
-                "start": round(segment.start, 3),
-                "end": round(segment.end, 3),
-                "text": segment.text.strip(),
-                "words": words
-            }
+
+            segment_obj = _segment_to_dict(segment)
             segments_list.append(segment_obj)
-            
+            text_parts.append(segment_obj["text"])
+
             # Calculate progress based on segment end time
             if total_duration > 0:
                 progress = 20 + (segment.end / total_duration) * 70
-                progress_callback(
-                    "processing",
-                    progress,
-                    f"Processed {segment_count} segments..."
-                )
+                now = time.monotonic()
+                if (now - last_emit_time > 0.1
+                        or int(progress) != last_progress_pct):
+                    last_emit_time = now
+                    last_progress_pct = int(progress)
+                    progress_callback(
+                        "processing",
+                        progress,
+                        f"Processed {segment_count} segments..."
+                    )
         
         elapsed_time = time.time() - start_time
         
-        # Build full text
-        full_text = " ".join(seg["text"] for seg in segments_list)
+        # Build full text, accumulated during the segment loop above so the
+        # finished list isn't walked a second time
+        full_text = " ".join(text_parts)
         
         # Calculate final duration from last segment
         final_duration = segments_list[-1]["end"] if segments_list else 0
@@ -278,43 +568,209 @@ def transcribe_audio(
         raise TranscriptionError(error_msg) from e
 
 
+def transcribe_batch(
+    audio_paths: List[str],
+    **kwargs,
+) -> List[Dict[str, Any]]:
+    """
+    Transcribe several files with one loaded model.
+
+    Accepts the same keyword arguments as transcribe_audio (minus model).
+    When the installed faster-whisper provides BatchedInferencePipeline,
+    decoding goes through it so the encoder runs batched; older versions
+    fall back to the plain model, which still amortizes the multi-second
+    load across all files. With num_workers > 1 the files themselves run
+    concurrently through a thread pool: the model is stateless per
+    transcribe() call and was built to accept that many callers, each with
+    its own cpu_threads slice of the cores. Returns one
+    transcribe_audio-shaped result per path, in order.
+    """
+    num_workers = kwargs.get("num_workers", 4)
+    device, compute_type = _resolve_device(
+        kwargs.get("device"), kwargs.get("compute_type", "auto")
+    )
+    kwargs["device"] = device
+    kwargs["compute_type"] = compute_type
+    model = _get_model(
+        kwargs.get("model_size", "large-v3"),
+        device,
+        compute_type,
+        kwargs.get("cpu_threads", 0),
+        num_workers,
+        kwargs.get("model_path", None),
+    )
+
+    try:
+        from faster_whisper import BatchedInferencePipeline
+        runner = BatchedInferencePipeline(model)
+    except ImportError:
+        runner = model
+
+    if len(audio_paths) > 1 and num_workers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            return list(pool.map(
+                lambda audio_path: transcribe_audio(
+                    audio_path, model=runner, **kwargs
+                ),
+                audio_paths,
+            ))
+
+    return [
+        transcribe_audio(audio_path, model=runner, **kwargs)
+        for audio_path in audio_paths
+    ]
+
+
+def transcribe_audio_iter(
+    audio_path: str,
+    model_size: str = "large-v3",
+    language: Optional[str] = None,
+    translate: bool = False,
+    device: Optional[str] = None,
+    compute_type: str = "auto",
+    beam_size: int = 5,
+    vad_filter: bool = True,
+    chunk_length: int = 30,
+    clip_timestamps: Optional[List[float]] = None,
+    condition_on_previous_text: Optional[bool] = None,
+    model_path: Optional[str] = None,
+    model: Optional["WhisperModel"] = None,
+):
+    """
+    Streaming variant of transcribe_audio.
+
+    Returns (info, segments) where info is faster-whisper's TranscriptionInfo
+    and segments is a generator yielding one segment dict at a time (same
+    shape as the entries of transcribe_audio()'s 'segments' list). Nothing is
+    accumulated, so peak memory is independent of transcript length.
+
+    Raises the same exceptions as transcribe_audio.
+    """
+    audio_file = Path(audio_path)
+    if not audio_file.exists() or not audio_file.is_file():
+        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+    if model is None:
+        device, compute_type = _resolve_device(device, compute_type)
+        model = _get_model(model_size, device, compute_type,
+                           model_path=model_path)
+
+    segments_generator, info = model.transcribe(
+        _decode_audio(str(audio_file)),
+        **_build_transcribe_kwargs(
+            beam_size, language, translate, vad_filter,
+            chunk_length, clip_timestamps, condition_on_previous_text
+        )
+    )
+
+    def _segments():
+        for segment in segments_generator:
+            yield _segment_to_dict(segment)
+
+    return info, _segments()
+
+
+# Parameters run() forwards to transcribe_audio, with their defaults.
+# Module-level so batch loops calling run() per file don't rebuild the
+# defaults (and the whitelist filters out run()-only kwargs).
+_RUN_DEFAULTS = {
+    "model_size": "large-v3",
+    "language": None,
+    "translate": False,
+    "device": None,
+    "compute_type": "auto",
+    "beam_size": 5,
+    "vad_filter": True,
+    "chunk_length": 30,
+    "clip_timestamps": None,
+    "condition_on_previous_text": None,
+    "cpu_threads": 0,
+    "num_workers": 4,
+    "model_path": None,
+    "on_progress": None,
+    "model": None,
+}
+
+
 def run(input_path: str, output_path: str, **kwargs) -> None:
-   
-    # Extract transcription parameters from kwargs, with defaults
-    transcribe_kwargs = {
-        "model_size": kwargs.get("model_size", "large-v3"),
-        "language": kwargs.get("language", None),
-        "translate": kwargs.get("translate", False),
-        "device": kwargs.get("device", "cpu"),
-        "compute_type": kwargs.get("compute_type", "int8"),
-        "beam_size": kwargs.get("beam_size", 5),
-        "vad_filter": kwargs.get("vad_filter", True),
-        "on_progress": kwargs.get("on_progress", None),
-    }
-    
+
+    # Defaults in one C-level copy, then overlay only the recognized keys
+    transcribe_kwargs = dict(_RUN_DEFAULTS)
+    transcribe_kwargs.update(
+        (key, value) for key, value in kwargs.items() if key in _RUN_DEFAULTS
+    )
+
     # Run transcription
     result = transcribe_audio(input_path, **transcribe_kwargs)
     
     # Save result to output file
     output_file = Path(output_path)
-    output_file.parent.mkdir(parents=True, exist_ok=True)  # Create parent directories if needed
-    output_file.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    _ensure_parent_dir(output_file)  # Create parent directories if needed
+    output_file.write_bytes(_dump_result(result, indent=True))
     
     # Print success message (for compatibility with main.py output expectations)
     print(f"RESULT_SAVED|{output_path}", flush=True)
 
 
+def run_batch(args) -> int:
+    """
+    Batch mode: transcribe jobs read from stdin, one
+    '<output_path>\t<audio_path>' line per job.
+
+    The model loads once (via the module cache) and is reused for every job,
+    so N short clips pay the multi-second load a single time. One line is
+    emitted per job: 'OK\t<output>\t<duration>' or 'ERR\t<output>\t<message>'.
+    """
+    exit_code = 0
+
+    for line in sys.stdin:
+        line = line.rstrip("\n")
+        if not line.strip():
+            continue
+
+        try:
+            output_path, audio_path = line.split("\t", 1)
+        except ValueError:
+            print(f"ERR\t\tMalformed batch line: {line}", flush=True)
+            exit_code = 1
+            continue
+
+        try:
+            result = transcribe_audio(
+                audio_path=audio_path,
+                model_size=args.model,
+                language=args.language,
+                translate=args.translate,
+                device=args.device,
+                compute_type=args.compute_type,
+                beam_size=args.beam_size,
+                vad_filter=not args.no_vad
+            )
+            output_file = Path(output_path)
+            _ensure_parent_dir(output_file)
+            output_file.write_bytes(_dump_result(result, indent=True))
+            print(f"OK\t{output_path}\t{result['duration']}", flush=True)
+        except Exception as e:
+            print(f"ERR\t{output_path}\t{e}", flush=True)
+            exit_code = 1
+
+    return exit_code
+
+
 def main():
     """Main entry point for CLI"""
     parser = argparse.ArgumentParser(
         description="Transcribe audio using Faster-Whisper"
     )
-    
+
     # Required arguments
     parser.add_argument(
         "audio_path",
         type=str,
-        help="Path to audio file"
+        nargs="*",
+        help="Path to one or more audio files"
     )
     
     # Optional arguments
@@ -342,17 +798,19 @@ def main():
     parser.add_argument(
         "--device",
         type=str,
-        default="cpu",
-        choices=["cpu", "cuda"],
-        help="Device to use (default: cpu)"
+        default="auto",
+        choices=["auto", "cpu", "cuda"],
+        help="Device to use (default: auto — cuda with int8_float16 when "
+             "a GPU is visible, else cpu)"
     )
     
     parser.add_argument(
         "--compute-type",
         type=str,
-        default="int8",
-        choices=["int8", "int16", "float16", "float32"],
-        help="Compute type (default: int8)"
+        default="auto",
+        choices=["auto", "int8", "int8_float16", "int8_bfloat16", "int16",
+                 "float16", "bfloat16", "float32"],
+        help="Compute type (default: auto — fastest supported on the device)"
     )
     
     parser.add_argument(
@@ -367,39 +825,179 @@ def main():
         action="store_true",
         help="Disable Voice Activity Detection"
     )
-    
+
+    cond_group = parser.add_mutually_exclusive_group()
+    cond_group.add_argument(
+        "--condition-on-previous",
+        dest="condition_on_previous",
+        action="store_true",
+        default=None,
+        help="Feed previous window text to the decoder (default: on for "
+             "beam sizes below 3, off otherwise)"
+    )
+    cond_group.add_argument(
+        "--no-condition-on-previous",
+        dest="condition_on_previous",
+        action="store_false",
+        help="Never condition on previous text"
+    )
+
+    parser.add_argument(
+        "--cpu-threads",
+        type=int,
+        default=0,
+        help="Intra-op CPU threads per transcribe call "
+             "(default: 0 = cpu_count split across workers)"
+    )
+
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=4,
+        help="Concurrent transcribe calls the model accepts; with several "
+             "audio paths the files run in parallel on this many threads "
+             "(default: 4)"
+    )
+
+    parser.add_argument(
+        "--model-path",
+        type=str,
+        default=None,
+        help="Local CT2-converted model directory; overrides --model and "
+             "loads mmap-backed instead of resolving a download"
+    )
+
     parser.add_argument(
         "--output",
         type=str,
         default=None,
         help="Output JSON file path (optional, prints to stdout if not specified)"
     )
-    
+
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Read '<output_path>\\t<audio_path>' jobs from stdin, "
+             "loading the model once for all of them"
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Emit one SEGMENT|{json} line per segment as it is decoded "
+             "and a small final RESULT| summary, instead of buffering the "
+             "whole transcript"
+    )
+
     args = parser.parse_args()
-    
+
+    # "auto" becomes the None sentinel understood by transcribe_audio
+    if args.device == "auto":
+        args.device = None
+
+    if args.batch:
+        sys.exit(run_batch(args))
+
+    if not args.audio_path:
+        parser.error("audio_path is required unless --batch is given")
+
+    # Streaming: segments go out as SEGMENT| lines the moment they are
+    # decoded (peak memory stays O(1) segments, consumers render partial
+    # results), then a final RESULT| carries only the small summary. Same
+    # protocol main.py speaks for '--output -'.
+    if args.stream:
+        if len(args.audio_path) > 1:
+            parser.error("--stream supports a single audio path")
+
+        start_time = time.time()
+        info, segments = transcribe_audio_iter(
+            args.audio_path[0],
+            model_size=args.model,
+            language=args.language,
+            translate=args.translate,
+            device=args.device,
+            compute_type=args.compute_type,
+            beam_size=args.beam_size,
+            vad_filter=not args.no_vad,
+            model_path=args.model_path
+        )
+
+        out = sys.stdout.buffer
+        segment_count = 0
+        duration = 0.0
+        text_parts = []
+        for segment_obj in segments:
+            segment_count += 1
+            duration = segment_obj["end"]
+            text_parts.append(segment_obj["text"])
+            out.write(b"SEGMENT|" + _dump_result(segment_obj) + b"\n")
+            out.flush()
+
+        elapsed_time = time.time() - start_time
+        result = {
+            "success": True,
+            "streamed": True,
+            "language": info.language,
+            "language_probability": round(info.language_probability, 3),
+            "duration": round(duration, 3),
+            "text": " ".join(text_parts),
+            "processing_time": round(elapsed_time, 2),
+            "model": args.model,
+            "device": args.device or "auto",
+            "segment_count": segment_count
+        }
+        if duration > 0:
+            rtf = elapsed_time / duration
+            result["real_time_factor"] = round(rtf, 3)
+            result["faster_than_realtime"] = bool(rtf < 1.0)
+        print(f"RESULT|{_dump_result(result).decode('utf-8')}", flush=True)
+        return
+
+    # Several files: one loaded model, batched encoder where available,
+    # one RESULT| line per file
+    if len(args.audio_path) > 1:
+        results = transcribe_batch(
+            args.audio_path,
+            model_size=args.model,
+            language=args.language,
+            translate=args.translate,
+            device=args.device,
+            compute_type=args.compute_type,
+            beam_size=args.beam_size,
+            vad_filter=not args.no_vad,
+            condition_on_previous_text=args.condition_on_previous,
+            cpu_threads=args.cpu_threads,
+            num_workers=args.num_workers,
+            model_path=args.model_path
+        )
+        for result in results:
+            print(f"RESULT|{_dump_result(result).decode('utf-8')}", flush=True)
+        return
+
     # Run transcription
     result = transcribe_audio(
-        audio_path=args.audio_path,
+        audio_path=args.audio_path[0],
         model_size=args.model,
         language=args.language,
         translate=args.translate,
         device=args.device,
         compute_type=args.compute_type,
         beam_size=args.beam_size,
-        vad_filter=not args.no_vad
+        vad_filter=not args.no_vad,
+        condition_on_previous_text=args.condition_on_previous,
+        cpu_threads=args.cpu_threads,
+        num_workers=args.num_workers,
+        model_path=args.model_path
     )
-    
-    # Output result (no indentation for single-line output)
-    result_json = json.dumps(result)
-    
+
     if args.output:
         output_path = Path(args.output)
         # Save with indentation for readability
-        output_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        output_path.write_bytes(_dump_result(result, indent=True))
         print(f"RESULT_SAVED|{args.output}", flush=True)
     else:
         # Print result to stdout with marker (single line to avoid parsing issues)
-        print(f"RESULT|{result_json}", flush=True)
+        print(f"RESULT|{_dump_result(result).decode('utf-8')}", flush=True)
 
 
 if __name__ == "__main__":